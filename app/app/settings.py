@@ -1,5 +1,6 @@
 from pathlib import Path
 import os
+import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -98,6 +99,18 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Running under `manage.py test`
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+
+if TESTING:
+    # PBKDF2 is deliberately slow; tests never need a strong hash.
+    PASSWORD_HASHERS = [
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+    ]
+    # Build the test database straight from the models, not migrations.
+    DATABASES["default"]["TEST"] = {"MIGRATE": False}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -86,6 +86,9 @@ class Tag(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "-name"])]
+
     def __str__(self):
         return self.name
 
@@ -99,5 +102,8 @@ class Ingredient(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "-name"])]
+
     def __str__(self) -> str:
         return self.name
@@ -4,11 +4,18 @@ Tests for models
 
 from decimal import Decimal
 from unittest.mock import patch
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 
 from core import models
 
+SAMPLE_EMAILS = (
+    ("test1@EXAMPLE.com", "test1@example.com"),
+    ("Test2@Example.com", "Test2@example.com"),
+    ("TEST3@EXAMPLE.COM", "TEST3@example.com"),
+    ("test4@example.COM", "test4@example.com"),
+)
+
 
 def create_user(email="user@example.com", password="test1234"):
     """Create a user and return it"""
@@ -31,18 +38,11 @@ class ModelTests(TestCase):
 
     def test_new_user_email_normalize(self):
         """Test email is normalized for new users."""
-        sample_email = [
-            ["test1@EXAMPLE.com", "test1@example.com"],
-            ["Test2@Example.com", "Test2@example.com"],
-            ["TEST3@EXAMPLE.COM", "TEST3@example.com"],
-            ["test4@example.COM", "test4@example.com"],
-        ]
-        for email, expected in sample_email:
-            user = get_user_model().objects.create_user(
-                email,
-                "sample123",
-            )
-            self.assertEqual(user.email, expected)
+        for email, expected in SAMPLE_EMAILS:
+            with self.subTest(email=email):
+                # no password: the hasher is irrelevant to normalization
+                user = get_user_model().objects.create_user(email)
+                self.assertEqual(user.email, expected)
 
     def test_user_without_email_raises_error(self):
         """Testing user with no email raises error"""
@@ -90,6 +90,10 @@ class ModelTests(TestCase):
         )
         self.assertEqual(str(ingredient), ingredient.name)
 
+
+class ModelUtilsTests(SimpleTestCase):
+    """Tests model helpers that do not touch the database"""
+
     @patch("core.models.uuid.uuid4")
     def test_recipe_file_name_uuid(self, mock_uuid):
         """
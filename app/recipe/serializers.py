@@ -20,7 +20,7 @@ class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ["id", "name"]
-        read_only_field = ["id"]
+        read_only_fields = ["id"]
 
 
 class RecipeSerializer(serializers.ModelSerializer):
@@ -42,26 +42,40 @@ class RecipeSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id"]
 
-    def _get_or_create_tags(self, tags, recipe):
-        """Handle creating or getting tags as needed."""
+    def _get_or_create_attrs(self, model, items):
+        """
+        Fetch or bulk create the named attributes for the authenticated user.
+        """
         auth_user = self.context["request"].user
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(
-                user=auth_user,
-                **tag,
+        names = list(dict.fromkeys(item["name"] for item in items))
+        objs = list(
+            model.objects.filter(user=auth_user, name__in=names).only(
+                "id",
+                "name",
+            )
+        )
+        existing = {obj.name for obj in objs}
+        missing = [name for name in names if name not in existing]
+        if missing:
+            # PostgreSQL returns the new primary keys from bulk_create
+            objs += model.objects.bulk_create(
+                [model(user=auth_user, name=name) for name in missing]
             )
-            recipe.tags.add(tag_obj)
+        return objs
+
+    def _get_or_create_tags(self, tags, recipe):
+        """Handle creating or getting tags as needed."""
+        tag_objs = self._get_or_create_attrs(Tag, tags)
+        if tag_objs:
+            recipe.tags.add(*tag_objs)
 
     def _get_or_create_ingredients(self, ingredients, recipe):
         """
         Handle for creating or getting ingredients as needed.
         """
-        auth_user = self.context["request"].user
-        for ingredient in ingredients:
-            ingredient_obj, create = Ingredient.objects.get_or_create(
-                user=auth_user, **ingredient
-            )
-            recipe.ingredients.add(ingredient_obj)
+        ingredient_objs = self._get_or_create_attrs(Ingredient, ingredients)
+        if ingredient_objs:
+            recipe.ingredients.add(*ingredient_objs)
 
     def create(self, validated_data):
         """Create a recipe"""
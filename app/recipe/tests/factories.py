@@ -0,0 +1,64 @@
+"""
+Helpers for creating objects used across the recipe API tests.
+"""
+
+from decimal import Decimal
+from types import MappingProxyType
+
+from django.contrib.auth import get_user_model
+
+from core.models import Recipe, Tag, Ingredient
+
+User = get_user_model()
+
+# Shared by every call, so read-only to keep tests from altering it.
+RECIPE_DEFAULTS = MappingProxyType(
+    {
+        "title": "Sample Recipe value",
+        "time_minutes": 22,
+        "price": Decimal("22.5"),
+        "description": "Sample Description of recipe",
+        "steps": "Sampele Recipe Steps",
+        "link": "www.example.com/recipe.pdf",
+    }
+)
+
+
+def create_recipe(user, **params):
+    """Create and return a sample recipe"""
+    return Recipe.objects.create(user=user, **{**RECIPE_DEFAULTS, **params})
+
+
+def create_recipes(user, *titles, **params):
+    """Create and return one sample recipe per title in a single query."""
+    return Recipe.objects.bulk_create(
+        [
+            Recipe(user=user, **{**RECIPE_DEFAULTS, "title": title, **params})
+            for title in titles
+        ]
+    )
+
+
+def create_tags(user, *names):
+    """Create and return one tag per name in a single query."""
+    return Tag.objects.bulk_create(
+        [Tag(user=user, name=name) for name in names]
+    )
+
+
+def create_ingredients(user, *names):
+    """Create and return one ingredient per name in a single query."""
+    return Ingredient.objects.bulk_create(
+        [Ingredient(user=user, name=name) for name in names]
+    )
+
+
+def make_user(email="user@example.com"):
+    """
+    Create and return a user with an unusable password.
+    For tests that only need a user to own objects or force_authenticate.
+    """
+    user = User(email=email)
+    user.set_unusable_password()
+    user.save()
+    return user
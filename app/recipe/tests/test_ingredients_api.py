@@ -4,11 +4,14 @@ Terst for the ingredients API.
 
 from decimal import Decimal
 
-from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.test import TestCase
 
-from rest_framework.test import APIClient
+from rest_framework.test import (
+    APIClient,
+    APIRequestFactory,
+    force_authenticate,
+)
 from rest_framework import status
 
 from core.models import (
@@ -16,53 +19,29 @@ from core.models import (
     Recipe,
 )
 
-from .test_recipe_api import create_recipe
+from .factories import create_recipe, make_user
 
 from recipe.serializers import IngredientSerializer
+from recipe.views import IngredientViewSet
 
 INGREDIENT_URL = reverse("recipe:ingredient-list")
+INGREDIENT_DETAIL_URL = reverse(
+    "recipe:ingredient-detail",
+    args=[0],
+).replace("/0/", "/{}/")
+
+# Calls the view directly, skipping middleware and URL resolution.
+factory = APIRequestFactory()
+ingredient_detail_view = IngredientViewSet.as_view(
+    {"patch": "partial_update", "delete": "destroy"},
+)
 
 
 def detail_url(ingredient_id):
     """
     Helper function for retrieving detail url
     """
-    return reverse(
-        "recipe:ingredient-detail",
-        args=[
-            ingredient_id,
-        ],
-    )
-
-
-def create_user(
-    email="user@example.com",
-    password="testpass123",
-):
-    """Helper function for creating a user."""
-    return get_user_model().objects.create(
-        email=email,
-        password=password,
-    )
-
-
-# def create_recipe(user, **params):
-#     """Create and return a sample recipe"""
-#     defaults = {
-#         "title": "Sample Recipe value",
-#         "time_minutes": 22,
-#         "price": Decimal("22.5"),
-#         "description": "Sample Description of recipe",
-#         "steps": "Sampele Recipe Steps",
-#         "link": "www.example.com/recipe.pdf",
-#     }
-#     defaults.update(params)
-#     recipe = Recipe.objects.create(user=user, **defaults)
-#     return recipe
-
-
-def create_ingredient(name="Test ingredient"):
-    return Ingredient.objects.create(name=name)
+    return INGREDIENT_DETAIL_URL.format(ingredient_id)
 
 
 class PublicIngredientAPITest(TestCase):
@@ -81,21 +60,31 @@ class PublicIngredientAPITest(TestCase):
 class PrivateIngredientAPITest(TestCase):
     """Test for authenticated user."""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user()
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
 
+    def setUp(self):
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients(self):
         """Test retrieving a list of ingredients."""
 
-        Ingredient.objects.create(user=self.user, name="Ingredient A")
-        Ingredient.objects.create(user=self.user, name="Ingredient b")
+        Ingredient.objects.bulk_create(
+            [
+                Ingredient(user=self.user, name="Ingredient A"),
+                Ingredient(user=self.user, name="Ingredient b"),
+            ]
+        )
 
-        res = self.client.get(INGREDIENT_URL)
+        with self.assertNumQueries(1):
+            res = self.client.get(INGREDIENT_URL)
 
-        ingredients = Ingredient.objects.all().order_by("-name")
+        ingredients = Ingredient.objects.filter(user=self.user).order_by(
+            "-name",
+        )
         serializer = IngredientSerializer(ingredients, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -103,11 +92,12 @@ class PrivateIngredientAPITest(TestCase):
 
     def test_retrieve_limited_to_user(self):
         """Test for ingredients to limited authenticated user."""
-        user2 = create_user(email="user2@example.com")
-        Ingredient.objects.create(user=user2, name="Salt")
-        ingredient = Ingredient.objects.create(
-            user=self.user,
-            name="Schezwan Sauce",
+        user2 = make_user(email="user2@example.com")
+        _, ingredient = Ingredient.objects.bulk_create(
+            [
+                Ingredient(user=user2, name="Salt"),
+                Ingredient(user=self.user, name="Schezwan Sauce"),
+            ]
         )
 
         res = self.client.get(INGREDIENT_URL)
@@ -125,7 +115,9 @@ class PrivateIngredientAPITest(TestCase):
 
         payload = {"name": "Red Spice"}
         url = detail_url(ingredient_id=ingredient.id)
-        res = self.client.patch(url, payload)
+        request = factory.patch(url, payload)
+        force_authenticate(request, user=self.user)
+        res = ingredient_detail_view(request, pk=ingredient.id)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         ingredient.refresh_from_db()
@@ -141,17 +133,22 @@ class PrivateIngredientAPITest(TestCase):
         )
         url = detail_url(ingredient_id=ingredient.id)
 
-        res = self.client.delete(url)
+        request = factory.delete(url)
+        force_authenticate(request, user=self.user)
+        res = ingredient_detail_view(request, pk=ingredient.id)
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
-        ingredients = Ingredient.objects.filter(user=self.user)
-        self.assertFalse(ingredients.exists())
+        self.assertFalse(Ingredient.objects.filter(id=ingredient.id).exists())
 
     def test_filter_ingredients_assigned_to_recipe(self):
         """
         Test listing ingredients by those assigned to recipes.
         """
-        ingd2 = Ingredient.objects.create(user=self.user, name="Sugar")
-        ingd1 = Ingredient.objects.create(user=self.user, name="potato")
+        ingd2, ingd1 = Ingredient.objects.bulk_create(
+            [
+                Ingredient(user=self.user, name="Sugar"),
+                Ingredient(user=self.user, name="potato"),
+            ]
+        )
         recipe = Recipe.objects.create(
             title="Aalo Paties",
             time_minutes=5,
@@ -1,57 +1,80 @@
 """Test for recipe api"""
 
+import io
 import os
+import shutil
 import tempfile
 
 from PIL import Image
 
 from decimal import Decimal
 
-from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import Recipe, Tag, Ingredient
-from recipe.serializers import (
-    RecipeSerializer,
-    RecipeDetailSerializer,
+from .factories import (
+    RECIPE_DEFAULTS,
+    create_recipe,
+    create_recipes,
+    create_tags,
+    create_ingredients,
+    make_user,
 )
 
 RECIPE_URL = reverse("recipe:recipe-list")
+# Resolved once; the helpers below only fill in the id.
+RECIPE_DETAIL_URL = reverse("recipe:recipe-detail", args=[0]).replace(
+    "/0/", "/{}/"
+)
+IMAGE_UPLOAD_URL = reverse("recipe:recipe-upload-image", args=[0]).replace(
+    "/0/", "/{}/"
+)
 
 
 def detail_url(recipe_id):
     """Create and return Recipe Details URL."""
-    return reverse("recipe:recipe-detail", args=[recipe_id])
+    return RECIPE_DETAIL_URL.format(recipe_id)
 
 
 def image_upload_url(recipe_id):
     """
     Create and return an image upload url.
     """
-    return reverse("recipe:recipe-upload-image", args=[recipe_id])
-
-
-def create_recipe(user, **params):
-    """Create and return a sample recipe"""
-    defaults = {
-        "title": "Sample Recipe value",
-        "time_minutes": 22,
-        "price": Decimal("22.5"),
-        "description": "Sample Description of recipe",
-        "steps": "Sampele Recipe Steps",
-        "link": "www.example.com/recipe.pdf",
+    return IMAGE_UPLOAD_URL.format(recipe_id)
+
+
+def recipe_list_item(recipe):
+    """
+    Return the JSON the recipe list endpoint renders for a recipe.
+    """
+    return {
+        "id": recipe.id,
+        "title": recipe.title,
+        "time_minutes": recipe.time_minutes,
+        "price": f"{recipe.price:.2f}",
+        "link": recipe.link,
+        "tags": [{"id": t.id, "name": t.name} for t in recipe.tags.all()],
+        "ingredients": [
+            {"id": i.id, "name": i.name} for i in recipe.ingredients.all()
+        ],
     }
-    defaults.update(params)
-    recipe = Recipe.objects.create(user=user, **defaults)
-    return recipe
 
 
-def create_user(**params):
-    return get_user_model().objects.create_user(**params)
+def sample_jpeg():
+    """
+    Create and return the bytes of a small JPEG image.
+    """
+    image_file = io.BytesIO()
+    Image.new("RGB", (10, 10)).save(image_file, format="JPEG")
+    return image_file.getvalue()
+
+
+SAMPLE_JPEG = sample_jpeg()
 
 
 class PublicRecipeAPITests(TestCase):
@@ -67,37 +90,71 @@ class PublicRecipeAPITests(TestCase):
 
 class PrivateRecipeAPITest(TestCase):
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user(email="user@example.com")
+
     def setUp(self) -> None:
-        self.client = APIClient()
-        self.user = create_user(
-            email="user@example.com",
-            password="testpass1234",
-        )
         self.client.force_authenticate(self.user)
 
+    def _assert_m2m_names(self, queryset, expected_names):
+        """Assert every expected name is in the queryset, in one query."""
+        names = set(queryset.values_list("name", flat=True))
+        self.assertLessEqual(set(expected_names), names)
+
     def test_retrive_recipes(self):
-        create_recipe(user=self.user)
-        create_recipe(user=self.user)
+        recipes = create_recipes(self.user, *(f"r{i}" for i in range(10)))
+        tags = create_tags(self.user, *(f"t{i}" for i in range(10)))
+        ingredients = create_ingredients(
+            self.user,
+            *(f"i{i}" for i in range(10)),
+        )
+        Recipe.tags.through.objects.bulk_create(
+            [
+                Recipe.tags.through(recipe=recipe, tag=tag)
+                for recipe, tag in zip(recipes, tags)
+            ]
+        )
+        Recipe.ingredients.through.objects.bulk_create(
+            [
+                Recipe.ingredients.through(recipe=recipe, ingredient=ingd)
+                for recipe, ingd in zip(recipes, ingredients)
+            ]
+        )
 
-        res = self.client.get(RECIPE_URL)
+        # recipes + prefetched tags + prefetched ingredients
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL)
 
-        recipes = Recipe.objects.all().order_by("-id")
-        serializer = RecipeSerializer(recipes, many=True)
+        recipes = (
+            Recipe.objects.all()
+            .prefetch_related("tags", "ingredients")
+            .order_by("-id")
+        )
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.json(), [recipe_list_item(r) for r in recipes])
 
     def test_recipe_list_limited_to_user(self):
         """Test list of recipes is limited to authenticated user."""
-        other_user = create_user(email="other@example.com", password="test123")
-        create_recipe(user=other_user)
-        create_recipe(user=self.user)
+        other_user = make_user(email="other@example.com")
+        Recipe.objects.bulk_create(
+            [
+                Recipe(user=other_user, **RECIPE_DEFAULTS),
+                Recipe(user=self.user, **RECIPE_DEFAULTS),
+            ]
+        )
 
         res = self.client.get(RECIPE_URL)
 
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
+        recipes = (
+            Recipe.objects.filter(user=self.user)
+            .prefetch_related("tags", "ingredients")
+            .order_by("-id")
+        )
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.json(), [recipe_list_item(r) for r in recipes])
 
     def test_get_recipe_detail(self):
         """Test for retrieving a recipe"""
@@ -105,8 +162,13 @@ class PrivateRecipeAPITest(TestCase):
         url = detail_url(recipe.id)
         res = self.client.get(url)
 
-        serializer = RecipeDetailSerializer(recipe)
-        self.assertEqual(res.data, serializer.data)
+        expected = {
+            **recipe_list_item(recipe),
+            "description": recipe.description,
+            "steps": recipe.steps,
+            "image": None,
+        }
+        self.assertEqual(res.json(), expected)
 
     def test_create_recipe(self):
         """Test for creating recipe"""
@@ -167,7 +229,7 @@ class PrivateRecipeAPITest(TestCase):
 
     def test_update_user_error(self):
         """Test for changing user results an error"""
-        new_user = create_user(email="other@gmail.com", password="test123")
+        new_user = make_user(email="other@gmail.com")
         recipe = create_recipe(user=self.user)
         payload = {"user": new_user.id}
         url = detail_url(recipe_id=recipe.id)
@@ -185,7 +247,7 @@ class PrivateRecipeAPITest(TestCase):
 
     def test_recipe_other_user_delete(self):
         """Test for other user's recipe's delete error"""
-        new_user = create_user(email="user2@example.com", password="1234test")
+        new_user = make_user(email="user2@example.com")
         recipe = create_recipe(user=new_user)
 
         url = detail_url(recipe.id)
@@ -211,16 +273,12 @@ class PrivateRecipeAPITest(TestCase):
 
         res = self.client.post(RECIPE_URL, payload, format="json")
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
-        recipe = recipes[0]
+        recipe = Recipe.objects.prefetch_related("tags").get(user=self.user)
         self.assertEqual(recipe.tags.count(), 3)
-        for tag in payload["tags"]:
-            exists = recipe.tags.filter(
-                name=tag["name"],
-                user=self.user,
-            ).exists()
-            self.assertTrue(exists)
+        self._assert_m2m_names(
+            recipe.tags.filter(user=self.user),
+            [tag["name"] for tag in payload["tags"]],
+        )
 
     def test_create_recipe_with_existing_tags(self):
         """Test for creating a recipe with existing tag."""
@@ -244,17 +302,32 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.post(RECIPE_URL, payload, format="json")
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
-        recipe = recipes[0]
+        recipe = Recipe.objects.prefetch_related("tags").get(user=self.user)
         self.assertEqual(recipe.tags.count(), 3)
         self.assertIn(tag_indian, recipe.tags.all())
-        for tag in payload["tags"]:
-            exists = recipe.tags.filter(
-                name=tag["name"],
-                user=self.user,
-            ).exists()
-            self.assertTrue(exists)
+        self._assert_m2m_names(
+            recipe.tags.filter(user=self.user),
+            [tag["name"] for tag in payload["tags"]],
+        )
+
+    def test_create_recipe_with_duplicate_tags(self):
+        """Test repeated tag names in payload create a single tag."""
+        payload = {
+            "title": "Masala Dosa",
+            "time_minutes": 40,
+            "price": Decimal("120"),
+            "tags": [
+                {"name": "South Indian"},
+                {"name": "South Indian"},
+            ],
+            "steps": "These are the steps below:",
+        }
+        res = self.client.post(RECIPE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=res.data["id"])
+        self.assertEqual(recipe.tags.count(), 1)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
 
     def test_create_tag_on_update(self):
         """Test creating tag when updating a recipe."""
@@ -311,16 +384,15 @@ class PrivateRecipeAPITest(TestCase):
             ],
         }
         res = self.client.post(RECIPE_URL, payload, format="json")
-        recipes = Recipe.objects.filter(user=self.user)
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(recipes.count(), 1)
-        recipe = recipes[0]
+        recipe = Recipe.objects.prefetch_related("ingredients").get(
+            user=self.user,
+        )
         self.assertEqual(recipe.ingredients.count(), 3)
-        for ingredient in payload["ingredients"]:
-            exists = recipe.ingredients.filter(
-                user=self.user, name=ingredient["name"]
-            ).exists()
-            self.assertTrue(exists)
+        self._assert_m2m_names(
+            recipe.ingredients.filter(user=self.user),
+            [ingredient["name"] for ingredient in payload["ingredients"]],
+        )
 
     def test_create_recipe_with_existing_ingredients(self):
         """Test for creating a recipe with existing ingredients."""
@@ -337,16 +409,15 @@ class PrivateRecipeAPITest(TestCase):
         }
         res = self.client.post(RECIPE_URL, payload, format="json")
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
-        recipes = Recipe.objects.filter(user=self.user)
-        self.assertEqual(recipes.count(), 1)
-        recipe = recipes[0]
+        recipe = Recipe.objects.prefetch_related("ingredients").get(
+            user=self.user,
+        )
         self.assertEqual(recipe.ingredients.count(), 2)
         self.assertIn(ingredient, recipe.ingredients.all())
-        for ingredient in payload["ingredients"]:
-            exists = recipe.ingredients.filter(
-                user=self.user, name=ingredient["name"]
-            ).exists()
-            self.assertTrue(exists)
+        self._assert_m2m_names(
+            recipe.ingredients.filter(user=self.user),
+            [ingredient["name"] for ingredient in payload["ingredients"]],
+        )
 
     def test_create_ingredient_on_update(self):
         """
@@ -411,47 +482,50 @@ class PrivateRecipeAPITest(TestCase):
         """
         Test filtering recipes by tags.
         """
-        r1 = create_recipe(user=self.user, title="Thai vegetable curry")
-        r2 = create_recipe(user=self.user, title="Kachori")
-        tag1 = Tag.objects.create(user=self.user, name="Vegan")
-        tag2 = Tag.objects.create(user=self.user, name="Vegetarian")
+        r1, r2, r3 = create_recipes(
+            self.user,
+            "Thai vegetable curry",
+            "Kachori",
+            "Veg Soya Biryani",
+        )
+        tag1, tag2 = create_tags(self.user, "Vegan", "Vegetarian")
         r1.tags.add(tag1)
         r2.tags.add(tag2)
-        r3 = create_recipe(user=self.user, title="Veg Soya Biryani")
         params = {"tags": f"{tag1.id},{tag2.id}"}
-        res = self.client.get(RECIPE_URL, params)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL, params)
 
-        s1 = RecipeSerializer(r1)
-        s2 = RecipeSerializer(r2)
-        s3 = RecipeSerializer(r3)
-        self.assertIn(s1.data, res.data)
-        self.assertIn(s2.data, res.data)
-        self.assertNotIn(s3.data, res.data)
+        data = res.json()
+        self.assertIn(recipe_list_item(r1), data)
+        self.assertIn(recipe_list_item(r2), data)
+        self.assertNotIn(recipe_list_item(r3), data)
 
     def test_filter_by_ingredients(self):
         """
         Test filtering recipes by ingredients.
         """
-        r1 = create_recipe(user=self.user, title="Veg Samosa")
-        r2 = create_recipe(user=self.user, title="Ghuziya")
-        ingd1 = Ingredient.objects.create(user=self.user, name="Maida Flour")
-        ingd2 = Ingredient.objects.create(user=self.user, name="Sugar")
-        ingd3 = Ingredient.objects.create(user=self.user, name="potato")
-        r1.ingredients.add(ingd1)
-        r1.ingredients.add(ingd3)
-        r2.ingredients.add(ingd1)
-        r2.ingredients.add(ingd2)
-        r3 = create_recipe(user=self.user, title="Dhokla")
+        r1, r2, r3 = create_recipes(
+            self.user,
+            "Veg Samosa",
+            "Ghuziya",
+            "Dhokla",
+        )
+        ingd1, ingd2, ingd3 = create_ingredients(
+            self.user,
+            "Maida Flour",
+            "Sugar",
+            "potato",
+        )
+        r1.ingredients.add(ingd1, ingd3)
+        r2.ingredients.add(ingd1, ingd2)
 
         params = {"ingredients": f"{ingd1.id},{ingd3.id}"}
-        res = self.client.get(RECIPE_URL, params)
-        s1 = RecipeSerializer(r1)
-        s2 = RecipeSerializer(r2)
-        s3 = RecipeSerializer(r3)
-
-        self.assertIn(s1.data, res.data)
-        self.assertIn(s2.data, res.data)
-        self.assertNotIn(s3.data, res.data)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL, params)
+        data = res.json()
+        self.assertIn(recipe_list_item(r1), data)
+        self.assertIn(recipe_list_item(r2), data)
+        self.assertNotIn(recipe_list_item(r3), data)
 
 
 class ImageUploadTests(TestCase):
@@ -459,17 +533,30 @@ class ImageUploadTests(TestCase):
     Test for the image upload API.
     """
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # uploads go to a throwaway directory removed with the class
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_settings = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.media_settings.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user(email="user@example.com")
+        # copied per test, so uploading to it does not leak between tests
+        cls.recipe = create_recipe(user=cls.user)
+
     def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
-            "user@example.com",
-            "passwrod123",
-        )
         self.client.force_authenticate(self.user)
-        self.recipe = create_recipe(user=self.user)
-
-    def tearDown(self) -> None:
-        self.recipe.image.delete()
 
     def test_upload_image(self):
         """
@@ -477,12 +564,13 @@ class ImageUploadTests(TestCase):
         """
 
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as image_file:
-            img = Image.new("RGB", (10, 10))
-            img.save(image_file, format="JPEG")
-            image_file.seek(0)
-            payload = {"image": image_file}
-            res = self.client.post(url, payload, format="multipart")
+        image_file = SimpleUploadedFile(
+            "image.jpg",
+            SAMPLE_JPEG,
+            content_type="image/jpeg",
+        )
+        payload = {"image": image_file}
+        res = self.client.post(url, payload, format="multipart")
 
         self.recipe.refresh_from_db()
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -2,7 +2,6 @@
 Test for the Tags aPI.
 """
 
-from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.test import TestCase
 
@@ -11,19 +10,15 @@ from rest_framework import status
 
 from core.models import Tag
 from recipe.serializers import TagSerializer
-from .test_recipe_api import create_recipe
+from .factories import create_recipe, create_tags, make_user
 
 TAGS_URL = reverse("recipe:tag-list")
+TAG_DETAIL_URL = reverse("recipe:tag-detail", args=[0]).replace("/0/", "/{}/")
 
 
 def detail_tag_url(tag_id):
     """Create and return a tag detail url."""
-    return reverse("recipe:tag-detail", args=[tag_id])
-
-
-def create_user(email="user@example.com", password="test1234"):
-    """Create a user and return it"""
-    return get_user_model().objects.create_user(email=email, password=password)
+    return TAG_DETAIL_URL.format(tag_id)
 
 
 class PublicTagsAPITest(TestCase):
@@ -42,25 +37,28 @@ class PublicTagsAPITest(TestCase):
 class PrivateTagsAPITest(TestCase):
     """Test for authentiucated user."""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user()
+
     def setUp(self) -> None:
-        self.client = APIClient()
-        self.user = create_user()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
         """Test retrieving a list of tags."""
-        Tag.objects.create(user=self.user, name="Vegan")
-        Tag.objects.create(user=self.user, name="Dessert")
+        create_tags(self.user, "Vegan", "Dessert")
 
-        res = self.client.get(TAGS_URL)
-        tags = Tag.objects.all().order_by("-name")
-        serializer = TagSerializer(tags, many=True)
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL)
+        tags = Tag.objects.filter(user=self.user).order_by("-name")
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.json(), list(tags.values("id", "name")))
 
     def test_tags_limited_to_user(self):
         """Test list of tags is l;imited to authenticated user."""
-        user2 = create_user(email="user2@example.com")
+        user2 = make_user(email="user2@example.com")
         Tag.objects.create(user=user2, name="Fruity")
         tag = Tag.objects.create(user=self.user, name="Strawberry")
 
@@ -87,8 +85,7 @@ class PrivateTagsAPITest(TestCase):
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
-        tags = Tag.objects.filter(user=self.user)
-        self.assertFalse(tags.exists())
+        self.assertFalse(Tag.objects.filter(id=tag.id).exists())
 
     def test_filter_tags_assigned_to_recipe(self):
         """
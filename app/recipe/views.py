@@ -1,5 +1,6 @@
 """Views for Recie APIs"""
 
+from django.db.models import Prefetch
 from rest_framework import (
     viewsets,
     mixins,
@@ -69,6 +70,13 @@ class RecipeViewSet(viewsets.ModelViewSet):
             queryset.filter(
                 user=self.request.user,
             )
+            .prefetch_related(
+                Prefetch("tags", queryset=Tag.objects.only("id", "name")),
+                Prefetch(
+                    "ingredients",
+                    queryset=Ingredient.objects.only("id", "name"),
+                ),
+            )
             .order_by("-id")
             .distinct()
         )